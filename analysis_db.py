@@ -0,0 +1,731 @@
+"""
+Analysis Database Access for Promiscuous-Peacock
+
+Shared ``run_sql`` path for the notebooks with query instrumentation. Every
+statement is timed and logged with its row count and ``EXPLAIN QUERY PLAN``,
+so f-string built queries that scan whole ``VIEW_Krankenhaus_*`` views are
+easy to spot.
+
+Features:
+- Drop-in ``run_sql(stmt) -> DataFrame`` replacement
+- Query log with duration, rows, plan and full-scan flags
+- Slow-query log via the ``logging`` module
+- Covering-index suggestions for flagged queries, created only on a working
+  copy of the database (the original file is never modified)
+- Compact loading: chunked reads into categoricals and the narrowest numeric
+  dtypes, with one category dictionary shared across queries so multi-year
+  concatenation stays categorical
+
+Usage:
+    from analysis_db import AnalysisDB
+
+    db = AnalysisDB(DB_FILE, slow_threshold=2.0)
+    run_sql = db.run_sql
+
+    hospital_ops_df = run_sql(...)
+    db.report()                  # one row per statement
+    db.suggest_indexes()         # CREATE INDEX statements for flagged queries
+
+    fast_db = db.create_indexes("all_data_indexed.db")
+    run_sql = fast_db.run_sql
+
+    # Compact mode: categories are shared by every read on this AnalysisDB
+    frames = [db.read_sql_compact(query_for(year)) for year in range(2011, 2024)]
+    icd_all_years = db.categories.concat(frames)
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import numpy as np
+import pandas as pd
+
+
+logger = logging.getLogger(__name__)
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+VIEW_PATTERN = re.compile(r"\bVIEW_Krankenhaus_\w+", re.IGNORECASE)
+IDENTIFIER = re.compile(r"\b[A-Za-z_][A-Za-z0-9_]*\b")
+
+# Clause that ends a WHERE / ON condition
+CLAUSE_END = re.compile(
+    r"\b(GROUP\s+BY|ORDER\s+BY|HAVING|LIMIT|UNION|JOIN|WHERE|LEFT|INNER|CROSS)\b",
+    re.IGNORECASE,
+)
+
+# Covering indexes wider than this cost more to maintain than they save
+MAX_INDEX_COLUMNS = 6
+
+# Text columns that are always stored as categoricals in compact mode
+CATEGORY_COLUMNS = [
+    "IK", "Name", "KH_Name", "Ort", "Postleitzahl", "Bundesland", "geo_Bundesland",
+    "KH_Type", "FA_Name", "hospital_type", "ICD_10", "OPS_301_Category",
+]
+
+# Integer keys that may be downcast below int32; counts keep at least int32 so
+# arithmetic on them (e.g. Anzahl * 2) cannot silently wrap
+INT_KEY_COLUMNS = ["Berichtsjahr"]
+
+# Other text columns become categorical if unique values / rows is at most this
+MAX_CATEGORY_RATIO = 0.5
+DEFAULT_CHUNKSIZE = 100_000
+
+
+# =============================================================================
+# QUERY RECORD
+# =============================================================================
+
+@dataclass
+class QueryRecord:
+    """
+    One executed statement.
+
+    Args:
+        sql: Statement text
+        duration: Wall time in seconds (query + DataFrame construction)
+        rows: Result row count
+        plan: EXPLAIN QUERY PLAN detail lines
+        views: VIEW_Krankenhaus_* views referenced by the statement
+        full_scans: Tables scanned without an index
+        memory_mb: Result size with default dtypes (compact reads only)
+        compact_memory_mb: Result size after compaction (compact reads only)
+    """
+    sql: str
+    duration: float
+    rows: int
+    plan: list[str] = field(default_factory=list)
+    views: list[str] = field(default_factory=list)
+    full_scans: list[str] = field(default_factory=list)
+    memory_mb: float | None = None
+    compact_memory_mb: float | None = None
+
+    @property
+    def flagged(self) -> bool:
+        """Whether the statement reads a hospital view via full table scans."""
+        return bool(self.views and self.full_scans)
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _strip_statement(stmt: str) -> str:
+    """Remove trailing semicolons/whitespace so the statement can be prefixed."""
+    return stmt.strip().rstrip(";").strip()
+
+
+def _full_scans(plan: list[str], aliases: dict[str, str] | None = None) -> list[str]:
+    """
+    Table names from plain 'SCAN <table>' plan lines (no index used).
+
+    Plans name tables by their alias ('SCAN p'); ``aliases`` (from
+    ``_table_aliases``) maps them back to the base table.
+    """
+    aliases = aliases or {}
+    scans = []
+    for detail in plan:
+        parts = detail.split()
+        if parts[1:2] == ["TABLE"]:  # older SQLite: 'SCAN TABLE name [AS alias]'
+            parts = parts[:1] + parts[2:]
+        if len(parts) >= 2 and parts[0] == "SCAN" and "USING" not in parts:
+            if parts[1] in ("CONSTANT", "SUBQUERY"):
+                continue
+            table = aliases.get(parts[1], parts[1])
+            if table not in scans:
+                scans.append(table)
+    return scans
+
+
+def _table_aliases(sql: str) -> dict[str, str]:
+    """Map 'FROM/JOIN table [AS] alias' aliases to their table names."""
+    aliases = {}
+    pattern = r"\b(?:FROM|JOIN)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?"
+    for table, alias in re.findall(pattern, sql, re.IGNORECASE):
+        aliases[table] = table
+        if alias and alias.upper() not in ("ON", "WHERE", "JOIN", "LEFT", "INNER", "CROSS", "GROUP", "ORDER"):
+            aliases[alias] = table
+    return aliases
+
+
+def _condition_identifiers(sql: str, keyword: str) -> list[str]:
+    """Identifiers used in WHERE or ON conditions, in order of appearance."""
+    found = []
+    for match in re.finditer(rf"\b{keyword}\b", sql, re.IGNORECASE):
+        rest = sql[match.end():]
+        end = CLAUSE_END.search(rest)
+        clause = rest[:end.start()] if end else rest
+        # Drop string literals so LIKE patterns are not read as columns
+        clause = re.sub(r"'[^']*'", "", clause)
+        for name in IDENTIFIER.findall(clause):
+            if name not in found:
+                found.append(name)
+    return found
+
+
+def _split_top_level(text: str) -> list[str]:
+    """Split on commas outside parentheses."""
+    parts, depth, start = [], 0, 0
+    for i, char in enumerate(text):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+        elif char == "," and depth == 0:
+            parts.append(text[start:i])
+            start = i + 1
+    parts.append(text[start:])
+    return parts
+
+
+def _view_columns(view_sql: str) -> dict[str, list[str]]:
+    """Map each output column of a view to the identifiers its expression uses."""
+    sql = re.sub(r"'[^']*'", "''", view_sql)
+    select = re.search(r"\bSELECT\b(?:\s+DISTINCT\b)?", sql, re.IGNORECASE)
+    if not select:
+        return {}
+    # Select list ends at the first FROM outside parentheses
+    depth, end = 0, len(sql)
+    for match in re.finditer(r"\(|\)|\bFROM\b", sql[select.end():], re.IGNORECASE):
+        token = match.group(0)
+        if token == "(":
+            depth += 1
+        elif token == ")":
+            depth -= 1
+        elif depth == 0:
+            end = select.end() + match.start()
+            break
+
+    mapping = {}
+    for expr in _split_top_level(sql[select.end():end]):
+        names = IDENTIFIER.findall(expr)
+        if not names:
+            continue
+        alias = re.search(r"\bAS\s+(\w+)\s*$", expr, re.IGNORECASE)
+        output = alias.group(1) if alias else names[-1]
+        mapping[output] = names[:-2] if alias else names
+    return mapping
+
+
+def _statement_columns(stmt: str, view_sqls: list[str]) -> list[str]:
+    """Identifiers a statement uses, with view columns replaced by their sources."""
+    names = IDENTIFIER.findall(re.sub(r"'[^']*'", "", stmt))
+    select_all = re.search(r"(?:\bSELECT|,)\s*(?:\w+\.)?\*", stmt, re.IGNORECASE)
+    used = list(names)
+    for view_sql in view_sqls:
+        mapping = _view_columns(view_sql)
+        for output, sources in mapping.items():
+            if select_all or output in names:
+                used.extend(sources)
+    return list(dict.fromkeys(used))
+
+
+def _prefix_like_columns(sql: str) -> set[str]:
+    """Columns filtered with LIKE 'prefix%' (index-able with COLLATE NOCASE)."""
+    return set(re.findall(r"(\w+)\s+LIKE\s+'[^%_']", sql, re.IGNORECASE))
+
+
+def memory_mb(df: pd.DataFrame) -> float:
+    """Deep memory usage of a DataFrame in MB."""
+    return df.memory_usage(deep=True).sum() / 1e6
+
+
+# =============================================================================
+# COMPACT LOADING
+# =============================================================================
+
+class CategoryRegistry:
+    """
+    Category dictionary and column dtypes shared across query results.
+
+    Categories are only ever appended, so codes stay valid for frames encoded
+    earlier; ``concat`` widens those frames to the full dictionary (a cheap
+    code remap) so multi-year concatenation keeps categorical dtypes instead
+    of re-expanding to strings.
+
+    The registry also remembers which text columns were decided to stay
+    plain and the dtype chosen for each numeric column, so every chunk and
+    year makes the same choice. All-NULL chunks and empty results (which
+    read_sql returns as object) are cast to those dtypes.
+    """
+
+    def __init__(self):
+        self._categories: dict[str, pd.Index] = {}
+        self._plain: set[str] = set()
+        self._dtypes: dict[str, np.dtype] = {}
+
+    def encode(self, series: pd.Series) -> pd.Series:
+        """Convert a text column to a categorical using the shared dictionary."""
+        name = series.name
+        known = self._categories.get(name)
+        values = pd.Index(series.dropna().unique())
+        if known is None:
+            known = values
+        else:
+            new = values[~values.isin(known)]
+            if len(new):
+                known = known.append(new)
+        self._categories[name] = known
+        return pd.Series(
+            pd.Categorical(series, categories=known), index=series.index, name=name
+        )
+
+    def dtype(self, column: str) -> pd.CategoricalDtype:
+        """Categorical dtype with every category seen so far for a column."""
+        return pd.CategoricalDtype(self._categories[column])
+
+    def keep_plain(self, column: str) -> None:
+        """Record that a text column stays uncompressed."""
+        self._plain.add(column)
+
+    def is_plain(self, column: str) -> bool:
+        """Whether a text column was decided to stay uncompressed."""
+        return column in self._plain
+
+    def record_dtype(self, column: str, dtype) -> np.dtype:
+        """Remember a numeric column's dtype, widening an earlier choice if needed."""
+        dtype = np.dtype(getattr(dtype, "numpy_dtype", dtype))
+        known = self._dtypes.get(column)
+        self._dtypes[column] = dtype if known is None else np.promote_types(known, dtype)
+        return self._dtypes[column]
+
+    def numeric_dtype(self, column: str) -> np.dtype | None:
+        """Dtype recorded for a numeric column, or None if not seen yet."""
+        return self._dtypes.get(column)
+
+    def cast(self, series: pd.Series) -> pd.Series:
+        """Cast to the recorded numeric dtype; integers with NULLs become nullable."""
+        target = self._dtypes[series.name]
+        if target.kind in "iu" and series.isna().any():
+            prefix = "UInt" if target.kind == "u" else "Int"
+            return series.astype(f"{prefix}{target.itemsize * 8}")
+        return series.astype(target)
+
+    def align(self, df: pd.DataFrame) -> pd.DataFrame:
+        """Widen a frame's columns to the current dictionary and dtypes."""
+        out = df.copy(deep=False)
+        for column in out.columns:
+            series = out[column]
+            if column in self._categories:
+                if isinstance(series.dtype, pd.CategoricalDtype):
+                    out[column] = series.cat.set_categories(self._categories[column])
+                elif series.isna().all():
+                    # All-NULL before the column was seen with values
+                    out[column] = series.astype(self.dtype(column))
+            elif column in self._dtypes and series.dtype != self._dtypes[column]:
+                out[column] = self.cast(series)
+        return out
+
+    def concat(self, frames: list[pd.DataFrame], **kwargs) -> pd.DataFrame:
+        """pd.concat that keeps shared categorical columns categorical."""
+        return pd.concat([self.align(df) for df in frames], **kwargs)
+
+    def __contains__(self, column: str) -> bool:
+        return column in self._categories
+
+
+def compact_frame(
+    df: pd.DataFrame,
+    categories: CategoryRegistry | None = None,
+    category_columns: list[str] | None = None,
+    downcast_floats: bool = True,
+    int_key_columns: list[str] | None = None,
+) -> pd.DataFrame:
+    """
+    Convert a frame to categoricals and the narrowest safe numeric dtypes.
+
+    Whether a text column becomes categorical, and which dtype a numeric
+    column gets, is decided the first time the registry sees the column with
+    values and then reused for later chunks and years.
+
+    Args:
+        df: Frame to compact (not modified)
+        categories: Shared dictionary (default: a new one for this frame)
+        category_columns: Text columns always made categorical
+            (default: CATEGORY_COLUMNS); other text columns are converted
+            when their unique ratio is at most MAX_CATEGORY_RATIO
+        downcast_floats: Downcast floats to float32 (~7 significant digits)
+        int_key_columns: Integer columns downcast below int32
+            (default: INT_KEY_COLUMNS); other integers stay at least int32
+
+    Returns:
+        Compacted copy of df
+    """
+    categories = categories if categories is not None else CategoryRegistry()
+    category_columns = CATEGORY_COLUMNS if category_columns is None else category_columns
+    int_key_columns = INT_KEY_COLUMNS if int_key_columns is None else int_key_columns
+    out = {}
+
+    for column in df.columns:
+        series = df[column]
+        known = categories.numeric_dtype(column)
+        if series.isna().all() and not pd.api.types.is_numeric_dtype(series):
+            # All NULL or no rows (read_sql returns object): reuse the dtype
+            # chosen earlier; undecided columns are cast later by concat
+            if column in categories or (column in category_columns and known is None):
+                out[column] = categories.encode(series)
+            elif known is not None:
+                out[column] = categories.cast(series)
+            else:
+                out[column] = series
+        elif pd.api.types.is_bool_dtype(series):
+            out[column] = series
+        elif pd.api.types.is_integer_dtype(series):
+            narrow = pd.to_numeric(series, downcast="integer")
+            if column not in int_key_columns and narrow.dtype.itemsize < 4:
+                narrow = narrow.astype("Int32" if pd.api.types.is_extension_array_dtype(narrow) else "int32")
+            if known is not None and known.kind == "f":
+                # Earlier chunks had NULLs and were read as floats
+                out[column] = narrow.astype(known)
+            else:
+                categories.record_dtype(column, narrow.dtype)
+                out[column] = categories.cast(narrow)
+        elif pd.api.types.is_float_dtype(series):
+            values = series.dropna()
+            if known is not None and known.kind in "iu" and (values == values.round()).all():
+                # NULLs in an integer column: read_sql returns floats
+                out[column] = categories.cast(series)
+            else:
+                narrow = pd.to_numeric(series, downcast="float") if downcast_floats else series
+                categories.record_dtype(column, narrow.dtype)
+                out[column] = categories.cast(narrow)
+        elif pd.api.types.is_object_dtype(series) or pd.api.types.is_string_dtype(series):
+            values = series.dropna()
+            if column in categories:
+                out[column] = categories.encode(series)
+            elif categories.is_plain(column):
+                out[column] = series
+            elif values.map(type).eq(str).all() and (
+                column in category_columns
+                or values.nunique() / len(series) <= MAX_CATEGORY_RATIO
+            ):
+                out[column] = categories.encode(series)
+            else:
+                categories.keep_plain(column)
+                out[column] = series
+        else:
+            out[column] = series
+
+    return pd.DataFrame(out, index=df.index)
+
+
+# =============================================================================
+# ANALYSIS DATABASE
+# =============================================================================
+
+class AnalysisDB:
+    """
+    Instrumented access to the analysis SQLite database.
+
+    Example:
+        db = AnalysisDB("all_data_2011-2023.db")
+        df = db.run_sql("SELECT ... FROM VIEW_Krankenhaus_Prozedur ...")
+        db.slow_queries()
+    """
+
+    def __init__(self, db_file: str | Path, slow_threshold: float = 1.0, explain: bool = True):
+        """
+        Args:
+            db_file: Path to the SQLite database
+            slow_threshold: Statements slower than this (seconds) are logged
+                as warnings
+            explain: Record EXPLAIN QUERY PLAN for each statement (default: True)
+        """
+        self._db_file = Path(db_file)
+        self._slow_threshold = slow_threshold
+        self._explain = explain
+        self._log: list[QueryRecord] = []
+        self._categories = CategoryRegistry()
+
+        if not self._db_file.exists():
+            raise FileNotFoundError(f"Database not found: {self._db_file}")
+
+    def get_db_connection(self) -> sqlite3.Connection:
+        """Open a new connection to the database."""
+        return sqlite3.connect(self._db_file, check_same_thread=False)
+
+    def run_sql(self, stmt: str) -> pd.DataFrame:
+        """Run a statement, log it, and return the result as a DataFrame."""
+        with closing(self.get_db_connection()) as con:
+            start = time.perf_counter()
+            df = pd.read_sql_query(stmt, con=con)
+            duration = time.perf_counter() - start
+            self._record(con, stmt, duration, len(df))
+        return df
+
+    def read_sql_compact(
+        self,
+        stmt: str,
+        chunksize: int = DEFAULT_CHUNKSIZE,
+        category_columns: list[str] | None = None,
+        downcast_floats: bool = True,
+        int_key_columns: list[str] | None = None,
+    ) -> pd.DataFrame:
+        """
+        Run a statement in chunks and return a memory-compact DataFrame.
+
+        Each chunk is compacted as soon as it is read, so the full result
+        never exists with default dtypes. Text columns share this
+        AnalysisDB's category dictionary (``categories``) across calls.
+        Memory before/after is logged and stored on the QueryRecord.
+
+        Args:
+            stmt: SQL statement
+            chunksize: Rows per read_sql chunk
+            category_columns: See compact_frame (default: CATEGORY_COLUMNS)
+            downcast_floats: Downcast floats to float32 (default: True)
+            int_key_columns: See compact_frame (default: INT_KEY_COLUMNS)
+        """
+        chunks, before = [], 0.0
+        with closing(self.get_db_connection()) as con:
+            start = time.perf_counter()
+            for chunk in pd.read_sql_query(stmt, con=con, chunksize=chunksize):
+                before += memory_mb(chunk)
+                chunks.append(compact_frame(
+                    chunk, self._categories, category_columns, downcast_floats, int_key_columns,
+                ))
+            if chunks:
+                df = self._categories.concat(chunks, ignore_index=True)
+            else:
+                # No rows: read_sql yields no chunks, so get the columns directly
+                empty = pd.read_sql_query(f"SELECT * FROM ({_strip_statement(stmt)}) LIMIT 0", con=con)
+                before = memory_mb(empty)
+                df = compact_frame(
+                    empty, self._categories, category_columns, downcast_floats, int_key_columns,
+                )
+            duration = time.perf_counter() - start
+            record = self._record(con, stmt, duration, len(df))
+
+        record.memory_mb = before
+        record.compact_memory_mb = memory_mb(df)
+        logger.info(
+            "Compact read: %d rows, %.1f MB -> %.1f MB",
+            record.rows, record.memory_mb, record.compact_memory_mb,
+        )
+        return df
+
+    @property
+    def categories(self) -> CategoryRegistry:
+        """Return the category dictionary shared by compact reads."""
+        return self._categories
+
+    def _record(self, con: sqlite3.Connection, stmt: str, duration: float, rows: int) -> QueryRecord:
+        """Log an executed statement (and warn if slow)."""
+        plan = self._query_plan(con, stmt) if self._explain else []
+        views = sorted(set(VIEW_PATTERN.findall(stmt)))
+        # Plan lines use aliases from the statement and the view definitions
+        text = "\n".join([stmt, *(self._object_sql(con, view) for view in views)])
+        record = QueryRecord(
+            sql=stmt,
+            duration=duration,
+            rows=rows,
+            plan=plan,
+            views=views,
+            full_scans=_full_scans(plan, _table_aliases(text)),
+        )
+        self._log.append(record)
+
+        if duration >= self._slow_threshold:
+            logger.warning(
+                "Slow query (%.2fs, %d rows%s): %s",
+                duration, record.rows,
+                f", full scan of {', '.join(record.full_scans)}" if record.flagged else "",
+                " ".join(stmt.split())[:200],
+            )
+        return record
+
+    def explain(self, stmt: str) -> list[str]:
+        """EXPLAIN QUERY PLAN detail lines for a statement (without running it)."""
+        with closing(self.get_db_connection()) as con:
+            return self._query_plan(con, stmt)
+
+    @staticmethod
+    def _query_plan(con: sqlite3.Connection, stmt: str) -> list[str]:
+        rows = con.execute(f"EXPLAIN QUERY PLAN {_strip_statement(stmt)}").fetchall()
+        return [row[-1] for row in rows]
+
+    @property
+    def log(self) -> list[QueryRecord]:
+        """Return all recorded statements in execution order."""
+        return self._log
+
+    def clear_log(self) -> None:
+        """Forget all recorded statements."""
+        self._log.clear()
+
+    def report(self) -> pd.DataFrame:
+        """
+        Query log as a DataFrame, slowest first.
+
+        Columns: sql, duration, rows, views, full_scans, flagged, plan,
+        memory_mb, compact_memory_mb
+        """
+        return pd.DataFrame([
+            {
+                "sql": " ".join(r.sql.split()),
+                "duration": r.duration,
+                "rows": r.rows,
+                "views": ", ".join(r.views),
+                "full_scans": ", ".join(r.full_scans),
+                "flagged": r.flagged,
+                "plan": "\n".join(r.plan),
+                "memory_mb": r.memory_mb,
+                "compact_memory_mb": r.compact_memory_mb,
+            }
+            for r in self._log
+        ], columns=[
+            "sql", "duration", "rows", "views", "full_scans", "flagged", "plan",
+            "memory_mb", "compact_memory_mb",
+        ]
+        ).sort_values("duration", ascending=False, ignore_index=True)
+
+    def slow_queries(self, threshold: float | None = None) -> pd.DataFrame:
+        """Statements slower than threshold (default: slow_threshold)."""
+        threshold = self._slow_threshold if threshold is None else threshold
+        report = self.report()
+        return report[report["duration"] >= threshold].reset_index(drop=True)
+
+    # -------------------------------------------------------------------------
+    # Index suggestions
+    # -------------------------------------------------------------------------
+
+    def suggest_indexes(self, records: list[QueryRecord] | None = None) -> list[str]:
+        """
+        Suggest covering indexes for flagged statements.
+
+        For every table read by the statement and the views it uses, one
+        index leads with the table's WHERE columns and one with its join
+        (ON) columns. Each is followed by the table's other filter, join and
+        selected columns, so the query can be answered from the index alone.
+        View columns the statement does not use are left out. Columns filtered
+        with LIKE 'prefix%' are indexed COLLATE NOCASE so SQLite can use the
+        index for the case-insensitive LIKE.
+
+        Args:
+            records: Statements to analyse (default: all flagged in the log)
+
+        Returns:
+            De-duplicated CREATE INDEX statements
+        """
+        records = records if records is not None else [r for r in self._log if r.flagged]
+        suggestions = []
+
+        with closing(self.get_db_connection()) as con:
+            for record in records:
+                # Filters and joins mostly live in the view definitions
+                view_sqls = [self._object_sql(con, view) for view in record.views]
+                text = record.sql + "\n" + "\n".join(view_sqls)
+                filters = _condition_identifiers(text, "WHERE")
+                joins = _condition_identifiers(text, "ON")
+                like_columns = _prefix_like_columns(text)
+                used = _statement_columns(record.sql, view_sqls)
+
+                for table in dict.fromkeys(_table_aliases(text).values()):
+                    columns = self._table_columns(con, table)
+                    if not columns:
+                        continue  # view or subquery, not a real table
+                    # Filter index lets SQLite start from the table, join
+                    # index lets it look rows up from the other side
+                    for lead in (
+                        [c for c in filters if c in columns],
+                        [c for c in joins if c in columns],
+                    ):
+                        if not lead:
+                            continue
+                        rest = [
+                            c for c in dict.fromkeys(filters + joins + used)
+                            if c in columns and c not in lead
+                        ]
+                        index_columns = (lead + rest)[:MAX_INDEX_COLUMNS]
+                        stmt = self._create_index_sql(table, index_columns, like_columns)
+                        if stmt not in suggestions:
+                            suggestions.append(stmt)
+
+        return suggestions
+
+    @staticmethod
+    def _create_index_sql(table: str, columns: list[str], like_columns: set[str]) -> str:
+        name = f"idx_{table}_{'_'.join(columns)}"[:120]
+        parts = [f"{c} COLLATE NOCASE" if c in like_columns else c for c in columns]
+        return f"CREATE INDEX IF NOT EXISTS {name} ON {table} ({', '.join(parts)})"
+
+    def create_indexes(
+        self,
+        working_copy: str | Path,
+        statements: list[str] | None = None,
+    ) -> "AnalysisDB":
+        """
+        Create suggested indexes on a working copy of the database.
+
+        The original database is copied with SQLite's backup API (only if the
+        working copy does not exist yet) and never modified.
+
+        Args:
+            working_copy: Path of the copy to create/extend
+            statements: CREATE INDEX statements (default: suggest_indexes())
+
+        Returns:
+            AnalysisDB for the working copy (same settings and category
+            dictionary, empty log)
+        """
+        working_copy = Path(working_copy)
+        if working_copy.resolve() == self._db_file.resolve():
+            raise ValueError("working_copy must differ from the original database")
+
+        statements = self.suggest_indexes() if statements is None else statements
+
+        if not working_copy.exists():
+            with closing(self.get_db_connection()) as src, closing(sqlite3.connect(working_copy)) as dst:
+                src.backup(dst)
+
+        with closing(sqlite3.connect(working_copy)) as con:
+            for stmt in statements:
+                con.execute(stmt)
+            con.execute("ANALYZE")
+            con.commit()
+
+        indexed = AnalysisDB(working_copy, self._slow_threshold, self._explain)
+        indexed._categories = self._categories
+        return indexed
+
+    @staticmethod
+    def _object_sql(con: sqlite3.Connection, name: str) -> str:
+        row = con.execute(
+            "SELECT sql FROM sqlite_master WHERE name = ? COLLATE NOCASE", (name,)
+        ).fetchone()
+        return row[0] if row and row[0] else ""
+
+    @staticmethod
+    def _table_columns(con: sqlite3.Connection, table: str) -> set[str]:
+        row = con.execute(
+            "SELECT type FROM sqlite_master WHERE name = ? COLLATE NOCASE", (table,)
+        ).fetchone()
+        if not row or row[0] != "table":
+            return set()
+        # Primary keys are already indexed
+        return {r[1] for r in con.execute(f'PRAGMA table_info("{table}")') if not r[5]}
+
+
+# =============================================================================
+# MODULE EXPORTS
+# =============================================================================
+
+__all__ = [
+    "AnalysisDB",
+    "QueryRecord",
+    "CategoryRegistry",
+    "compact_frame",
+    "memory_mb",
+    "CATEGORY_COLUMNS",
+    "INT_KEY_COLUMNS",
+]
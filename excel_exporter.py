@@ -0,0 +1,188 @@
+"""
+Excel Exporter Module for Promiscuous-Peacock
+
+Streaming multi-sheet Excel export for target lists, rankings and regional
+summaries. Workbooks are written with openpyxl's write-only mode, so rows
+are streamed to disk instead of building the whole workbook in memory.
+
+- Number formats follow the same column rules as ``SlideBuilder.table``
+  (see ``ppt_generator.column_format``)
+- Formats and column widths are resolved once per column; data cells share
+  the column's pre-built style instead of resolving a style per cell
+- Many workbooks (e.g. one per region) can be written in parallel processes
+
+Usage:
+    from excel_exporter import export_workbook, export_workbooks
+
+    export_workbook(
+        f"target_hospitals_{timestamp}.xlsx",
+        {
+            "Tier1_Priority": tier1[export_cols],
+            "Tier2_Secondary": tier2[export_cols],
+            "Tier3_Reference": tier3[export_cols],
+        },
+    )
+
+    # One workbook per Bundesland, written in parallel
+    export_workbooks({
+        f"targets_{state}.xlsx": {"Ranking": group[export_cols]}
+        for state, group in hospital_ranked.groupby("Bundesland")
+    })
+"""
+
+from __future__ import annotations
+
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from openpyxl import Workbook
+from openpyxl.cell import Cell, WriteOnlyCell
+from openpyxl.styles import Font, NamedStyle
+from openpyxl.utils import get_column_letter
+
+from ppt_generator import BRAND, COLUMN_FORMATS, column_format, format_value
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+HEADER_STYLE = "brand_header"
+MIN_COLUMN_WIDTH = 8
+MAX_COLUMN_WIDTH = 60
+
+# Excel sheet names are limited to 31 characters
+MAX_SHEET_NAME = 31
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def _register_styles(wb: Workbook) -> None:
+    """Register one named style per column format kind plus the header style."""
+    font_color = BRAND["text_dark"].lstrip("#")
+    header = NamedStyle(name=HEADER_STYLE)
+    header.font = Font(name=BRAND["font"], bold=True, color=font_color)
+    wb.add_named_style(header)
+
+    for kind, (_, number_format) in COLUMN_FORMATS.items():
+        style = NamedStyle(name=f"brand_{kind}")
+        style.font = Font(name=BRAND["font"], color=font_color)
+        style.number_format = number_format
+        wb.add_named_style(style)
+
+
+def column_width(series: "pd.Series", header: str, kind: str | None = None) -> float:
+    """Column width in characters from the longest header or formatted value."""
+    kind = kind or column_format(series)
+    longest = len(str(header))
+    if len(series):
+        longest = max(longest, max(len(format_value(v, kind)) for v in series.tolist()))
+    return float(min(MAX_COLUMN_WIDTH, max(MIN_COLUMN_WIDTH, longest + 2)))
+
+
+def _write_sheet(wb: Workbook, sheet_name: str, data: "pd.DataFrame") -> None:
+    """Stream one DataFrame into a new write-only sheet."""
+    import pandas as pd
+
+    ws = wb.create_sheet(title=sheet_name[:MAX_SHEET_NAME])
+
+    # Per-column decisions, made once before any rows are written
+    styles = []
+    for col_idx, col_name in enumerate(data.columns, start=1):
+        series = data[col_name]
+        kind = column_format(series)
+        template = WriteOnlyCell(ws)
+        template.style = f"brand_{kind}"
+        styles.append(template._style)
+        ws.column_dimensions[get_column_letter(col_idx)].width = column_width(series, col_name, kind)
+    ws.freeze_panes = "A2"
+
+    header_row = []
+    for col_name in data.columns:
+        cell = WriteOnlyCell(ws, value=str(col_name))
+        cell.style = HEADER_STYLE
+        header_row.append(cell)
+    ws.append(header_row)
+
+    # Column-wise conversion to Python objects; NaN/NA become empty cells
+    columns = [
+        [None if pd.isna(v) else v for v in data[col].tolist()]
+        for col in data.columns
+    ]
+    for values in zip(*columns):
+        ws.append([
+            Cell(ws, row=1, column=1, value=value, style_array=style)
+            for value, style in zip(values, styles)
+        ])
+
+
+# =============================================================================
+# EXPORT FUNCTIONS
+# =============================================================================
+
+def export_workbook(path: str | Path, sheets: dict[str, "pd.DataFrame"]) -> Path:
+    """
+    Write DataFrames to a multi-sheet workbook in streaming mode.
+
+    Args:
+        path: Output .xlsx path
+        sheets: Sheet name -> DataFrame (index is not written)
+
+    Returns:
+        Path to saved file
+    """
+    if not sheets:
+        raise ValueError("sheets must contain at least one DataFrame")
+
+    path = Path(path)
+    wb = Workbook(write_only=True)
+    _register_styles(wb)
+    for sheet_name, data in sheets.items():
+        _write_sheet(wb, sheet_name, data)
+    wb.save(str(path))
+    return path
+
+
+def _export_job(job: tuple[str | Path, dict[str, "pd.DataFrame"]]) -> Path:
+    """Process pool entry point."""
+    path, sheets = job
+    return export_workbook(path, sheets)
+
+
+def export_workbooks(
+    workbooks: dict[str | Path, dict[str, "pd.DataFrame"]],
+    max_workers: int | None = None,
+) -> list[Path]:
+    """
+    Write many workbooks in parallel processes.
+
+    Args:
+        workbooks: Output path -> {sheet name -> DataFrame}
+        max_workers: Process count (default: number of CPUs); 1 writes serially
+
+    Returns:
+        Paths to saved files, in input order
+    """
+    jobs = list(workbooks.items())
+    if max_workers == 1 or len(jobs) <= 1:
+        return [_export_job(job) for job in jobs]
+
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        return list(pool.map(_export_job, jobs))
+
+
+# =============================================================================
+# MODULE EXPORTS
+# =============================================================================
+
+__all__ = [
+    "export_workbook",
+    "export_workbooks",
+    "column_width",
+]
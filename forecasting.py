@@ -0,0 +1,313 @@
+"""
+Procedure Volume Forecasting for Promiscuous-Peacock
+
+Batched forecasts of OPS 5-820..5-823 volumes per hospital or per Bundesland.
+Every series is fitted with the same robust model at once - one stacked NumPy
+least-squares solve per iteration instead of a Python loop per series.
+
+Model (per series):
+    y_t = level + trend * t + covid_2020 * D_2020 + covid_2021 * D_2021 + e_t
+
+- Fitted with Huber-weighted iteratively reweighted least squares, so single
+  outlier years do not drive the trend
+- COVID dummies absorb the 2020/2021 dip and are switched off when forecasting
+- The trend is damped (phi < 1) so long horizons flatten out
+- Missing years are handled with zero weights, not by dropping the series
+- Each series is forecast from its own last reported year; ``last_year`` in
+  the output shows series that stopped reporting
+
+Usage:
+    from forecasting import ForecastConfig, forecast_volumes
+
+    history = run_sql(HOSPITAL_VOLUMES_SQL)
+    fc = forecast_volumes(history, by=["IK"], value_col="total_procedures")
+
+    # Per Bundesland: aggregate first, then forecast
+    fc_state = forecast_volumes(history, by=["Bundesland"], value_col="total_procedures")
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass, field
+from statistics import NormalDist
+
+import numpy as np
+import pandas as pd
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+COVID_YEARS = (2020, 2021)
+FORECAST_YEARS = (2024, 2025, 2026, 2027)
+
+# One row per hospital and reporting year with the joint replacement volumes
+HOSPITAL_VOLUMES_SQL = """
+SELECT
+    Berichtsjahr,
+    IK,
+    Name,
+    MIN(geo_Bundesland) AS Bundesland,
+    SUM(CASE WHEN OPS_301_Category LIKE '5-820%' THEN Anzahl ELSE 0 END) AS hip_primary,
+    SUM(CASE WHEN OPS_301_Category LIKE '5-821%' THEN Anzahl ELSE 0 END) AS hip_revision,
+    SUM(CASE WHEN OPS_301_Category LIKE '5-822%' THEN Anzahl ELSE 0 END) AS knee_primary,
+    SUM(CASE WHEN OPS_301_Category LIKE '5-823%' THEN Anzahl ELSE 0 END) AS knee_revision,
+    SUM(Anzahl) AS total_procedures
+FROM VIEW_Krankenhaus_Prozedur
+WHERE OPS_301_Category LIKE '5-820%'
+   OR OPS_301_Category LIKE '5-821%'
+   OR OPS_301_Category LIKE '5-822%'
+   OR OPS_301_Category LIKE '5-823%'
+GROUP BY Berichtsjahr, IK, Name
+"""
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+@dataclass
+class ForecastConfig:
+    """
+    Model settings shared by all series.
+
+    Args:
+        forecast_years: Years to forecast (default: 2024-2027)
+        covid_years: Years that get their own dummy (default: 2020, 2021)
+        damping: Trend damping factor phi, 1.0 = undamped linear trend
+        interval: Central prediction interval coverage (default: 0.8)
+        huber_k: Huber threshold in robust standard deviations
+        iterations: IRLS iterations
+        min_observations: Series with fewer non-COVID years get a flat forecast
+    """
+    forecast_years: tuple[int, ...] = FORECAST_YEARS
+    covid_years: tuple[int, ...] = COVID_YEARS
+    damping: float = 0.9
+    interval: float = 0.8
+    huber_k: float = 1.345
+    iterations: int = 5
+    min_observations: int = 3
+    ridge: float = field(default=1e-8, repr=False)
+
+
+# =============================================================================
+# BATCHED FITTING
+# =============================================================================
+
+def _design_matrix(years: np.ndarray, covid_years: tuple[int, ...]) -> np.ndarray:
+    """Intercept, centered trend and one dummy per COVID year present."""
+    t = years - years.max()  # re-anchored per series in fit_series
+    columns = [np.ones_like(t, dtype=float), t.astype(float)]
+    for year in covid_years:
+        if year in years:
+            columns.append((years == year).astype(float))
+    return np.column_stack(columns)
+
+
+def _weighted_solve(X: np.ndarray, Y: np.ndarray, W: np.ndarray, ridge: float):
+    """
+    Solve one weighted least-squares problem per row of Y in a single call.
+
+    Args:
+        X: Shared design matrix (n_years x p)
+        Y: Observations (n_series x n_years), NaN-free
+        W: Weights (n_series x n_years), 0 for missing years
+
+    Returns:
+        (coefficients n_series x p, inverse normal matrices n_series x p x p)
+    """
+    XtWX = np.einsum("tp,st,tq->spq", X, W, X)
+    XtWX += ridge * np.eye(X.shape[1])
+    XtWy = np.einsum("tp,st->sp", X, W * Y)
+    inv = np.linalg.inv(XtWX)
+    beta = np.einsum("spq,sq->sp", inv, XtWy)
+    return beta, inv
+
+
+def fit_series(
+    matrix: np.ndarray,
+    years: np.ndarray,
+    config: ForecastConfig | None = None,
+) -> dict[str, np.ndarray]:
+    """
+    Fit the robust damped-trend model to all series at once.
+
+    Args:
+        matrix: Volumes (n_series x n_years), NaN for missing years
+        years: Reporting years matching the matrix columns
+        config: ForecastConfig (default: ForecastConfig())
+
+    Returns:
+        Dict with 'level' (at each series' last observed year), 'trend',
+        'sigma', 'inv' (per-series (X'WX)^-1 for level and trend), 'n_obs',
+        'flat' (series that fell back to a flat forecast) and 'last_year'
+    """
+    config = config or ForecastConfig()
+    years = np.asarray(years)
+    X = _design_matrix(years, config.covid_years)
+
+    observed = ~np.isnan(matrix)
+    Y = np.where(observed, matrix, 0.0)
+    base_w = observed.astype(float)
+    W = base_w.copy()
+
+    for _ in range(config.iterations):
+        beta, inv = _weighted_solve(X, Y, W, config.ridge)
+        resid = (Y - beta @ X.T) * base_w
+        # Robust scale per series: 1.4826 * median absolute residual
+        abs_resid = np.where(observed, np.abs(resid), np.nan)
+        scale = 1.4826 * np.nanmedian(abs_resid, axis=1, keepdims=True)
+        scale = np.where((scale > 0) & np.isfinite(scale), scale, 1.0)
+        u = np.abs(resid) / (config.huber_k * scale)
+        W = base_w * np.minimum(1.0, 1.0 / np.maximum(u, 1e-12))
+
+    beta, inv = _weighted_solve(X, Y, W, config.ridge)
+    resid = (Y - beta @ X.T) * base_w
+    n_obs = base_w.sum(axis=1)
+    dof = np.maximum(n_obs - X.shape[1], 1.0)
+    sigma = np.sqrt((W * resid ** 2).sum(axis=1) / dof)
+
+    # Move each level from the last common year to the series' own last year:
+    # level' = level + trend * shift, i.e. beta' = A beta and inv' = A inv A^T
+    last_year = np.where(observed, years, years.min()).max(axis=1)
+    shift = (last_year - years.max()).astype(float)
+    A = np.broadcast_to(np.eye(X.shape[1]), inv.shape).copy()
+    A[:, 0, 1] = shift
+    inv = np.einsum("spq,sqr,str->spt", A, inv, A)
+    level = beta[:, 0] + beta[:, 1] * shift
+    trend = beta[:, 1].copy()
+
+    # Too little history outside COVID years for a trend: flat at the mean of
+    # the non-COVID years (all years only if every observation is COVID)
+    non_covid = observed & ~np.isin(years, config.covid_years)
+    flat = non_covid.sum(axis=1) < config.min_observations
+    if flat.any():
+        used = np.where(non_covid.any(axis=1, keepdims=True), non_covid, observed)[flat]
+        n_used = used.sum(axis=1)
+        values = np.where(used, matrix[flat], 0.0)
+        mean = values.sum(axis=1) / np.maximum(n_used, 1)
+        ss = (np.where(used, values - mean[:, None], 0.0) ** 2).sum(axis=1)
+        level[flat] = mean
+        trend[flat] = 0.0
+        # Sample standard deviation; undefined (NaN intervals) below two points
+        sigma[flat] = np.where(n_used > 1, np.sqrt(ss / np.maximum(n_used - 1, 1)), np.nan)
+        # Variance of a plain mean: only the level term remains
+        inv[flat] = 0.0
+        inv[flat, 0, 0] = 1.0 / np.maximum(n_used, 1)
+
+    return {
+        "level": level,
+        "trend": trend,
+        "sigma": sigma,
+        "inv": inv,
+        "n_obs": n_obs.astype(int),
+        "flat": flat,
+        "last_year": last_year.astype(int),
+    }
+
+
+def predict(fit: dict[str, np.ndarray], config: ForecastConfig | None = None) -> dict[str, np.ndarray]:
+    """
+    Damped-trend point forecasts and prediction intervals.
+
+    Returns:
+        Dict with 'forecast', 'lower', 'upper' (each n_series x n_horizons);
+        intervals are NaN where sigma is undefined
+    """
+    config = config or ForecastConfig()
+    # Steps ahead per series, counted from each series' own last year
+    steps = np.asarray(config.forecast_years)[None, :] - fit["last_year"][:, None]
+    steps = np.maximum(steps, 0)
+    # Cumulative damped trend multiplier: phi + phi^2 + ... + phi^h
+    cumulative = np.concatenate([
+        [0.0], np.cumsum(config.damping ** np.arange(1, steps.max() + 1, dtype=float))
+    ])
+    damped = cumulative[steps]
+
+    forecast = fit["level"][:, None] + fit["trend"][:, None] * damped
+
+    # Parameter + noise variance, x_h = [1, damped_h, 0, ...]
+    inv = fit["inv"]
+    param_var = (
+        inv[:, 0, 0][:, None]
+        + 2 * damped * inv[:, 0, 1][:, None]
+        + damped ** 2 * inv[:, 1, 1][:, None]
+    )
+    sigma = fit["sigma"][:, None]
+    z = NormalDist().inv_cdf(0.5 + config.interval / 2)
+    half_width = z * sigma * np.sqrt(1.0 + np.maximum(param_var, 0.0))
+
+    # Volumes cannot be negative
+    forecast = np.maximum(forecast, 0.0)
+    return {
+        "forecast": forecast,
+        "lower": np.maximum(forecast - half_width, 0.0),
+        "upper": forecast + half_width,
+    }
+
+
+# =============================================================================
+# DATAFRAME API
+# =============================================================================
+
+def forecast_volumes(
+    history: pd.DataFrame,
+    by: list[str],
+    value_col: str = "total_procedures",
+    config: ForecastConfig | None = None,
+    year_col: str = "Berichtsjahr",
+) -> pd.DataFrame:
+    """
+    Forecast every series in a long history frame.
+
+    Args:
+        history: One row per series and year (e.g. from HOSPITAL_VOLUMES_SQL)
+        by: Series key columns, e.g. ['IK'], ['hospital_id'] or ['Bundesland']
+        value_col: Volume column to forecast
+        config: ForecastConfig (default: ForecastConfig())
+        year_col: Reporting year column
+
+    Returns:
+        Long DataFrame with the key columns, Berichtsjahr, forecast, lower,
+        upper, n_obs, flat_forecast and last_year (the series' last reported
+        year; earlier than the data's last year for stale series)
+    """
+    config = config or ForecastConfig()
+
+    # Rows are summed per key and year, so coarser keys aggregate automatically
+    matrix_df = history.pivot_table(
+        index=by, columns=year_col, values=value_col, aggfunc="sum"
+    )
+    years = matrix_df.columns.to_numpy(dtype=int)
+    matrix = matrix_df.to_numpy(dtype=float)
+
+    fit = fit_series(matrix, years, config)
+    pred = predict(fit, config)
+
+    n_series, n_horizons = pred["forecast"].shape
+    keys = matrix_df.index.to_frame(index=False)
+    out = keys.loc[keys.index.repeat(n_horizons)].reset_index(drop=True)
+    out[year_col] = np.tile(np.asarray(config.forecast_years), n_series)
+    out["forecast"] = pred["forecast"].ravel()
+    out["lower"] = pred["lower"].ravel()
+    out["upper"] = pred["upper"].ravel()
+    out["n_obs"] = np.repeat(fit["n_obs"], n_horizons)
+    out["flat_forecast"] = np.repeat(fit["flat"], n_horizons)
+    out["last_year"] = np.repeat(fit["last_year"], n_horizons)
+    return out
+
+
+# =============================================================================
+# MODULE EXPORTS
+# =============================================================================
+
+__all__ = [
+    "ForecastConfig",
+    "forecast_volumes",
+    "fit_series",
+    "predict",
+    "COVID_YEARS",
+    "FORECAST_YEARS",
+    "HOSPITAL_VOLUMES_SQL",
+]
@@ -0,0 +1,420 @@
+"""
+Hospital Identity Index for Promiscuous-Peacock
+
+Links hospital sites across reporting years (2011-2023) even when the IK
+(Institutionskennzeichen) or the hospital name changes between GBA quality
+reports. Each (Berichtsjahr, IK, Name) record is assigned a stable
+``hospital_id`` so analyses can group and merge on identity instead of on
+``IK, Name`` or ``KH_Name``.
+
+Matching strategy:
+- Exact: same IK and same normalized name are always the same site
+- Blocked fuzzy: candidates are only compared within the same IK or the same
+  Postleitzahl, and are linked when name similarity is high and address or
+  coordinates agree
+- Never merged: clusters that report under different IKs in the same
+  Berichtsjahr (e.g. a children's clinic next to its university hospital)
+
+Usage:
+    from hospital_index import HospitalIndex, load_sites
+
+    with sqlite3.connect(DB_FILE) as con:
+        index = HospitalIndex.build(load_sites(con))
+        index.save(con)
+
+    # Rebuild after new reports arrive, keeping existing hospital_ids
+    with sqlite3.connect(DB_FILE) as con:
+        index = HospitalIndex.build(load_sites(con), previous=HospitalIndex.load(con))
+        index.save(con)
+
+    # In SQL
+    SELECT hi.hospital_id, SUM(v.Anzahl) ...
+    FROM VIEW_Krankenhaus_Prozedur v
+    JOIN HOSPITAL_IDENTITY hi
+      ON hi.Berichtsjahr = v.Berichtsjahr AND hi.IK = v.IK AND hi.Name = v.Name
+
+    # In pandas
+    df = df.merge(index.lookup, on=["Berichtsjahr", "IK", "Name"], how="left")
+"""
+
+from __future__ import annotations
+
+import re
+import sqlite3
+import unicodedata
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+
+import numpy as np
+import pandas as pd
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+INDEX_TABLE = "HOSPITAL_IDENTITY"
+
+# One row per reporting year and hospital site
+SITES_SQL = """
+SELECT
+    Berichtsjahr,
+    IK,
+    Name,
+    MIN(Strasse) AS Strasse,
+    MIN(Hausnummer) AS Hausnummer,
+    MIN(Postleitzahl) AS Postleitzahl,
+    MIN(Ort) AS Ort,
+    AVG(geo_Lat) AS Latitude,
+    AVG(geo_Lon) AS Longitude
+FROM VIEW_Krankenhaus_GEO
+GROUP BY Berichtsjahr, IK, Name
+"""
+
+SITE_COLUMNS = [
+    "Berichtsjahr", "IK", "Name", "Strasse", "Hausnummer",
+    "Postleitzahl", "Ort", "Latitude", "Longitude",
+]
+
+# Legal forms and filler words that change between reports without the
+# hospital changing
+NAME_STOPWORDS = {
+    "ggmbh", "gmbh", "mbh", "ag", "gag", "eingetragener", "verein", "kdoer", "aoer", "kg",
+    "co", "und", "der", "die", "das", "des", "fuer", "am", "an", "im", "in",
+}
+
+NAME_ABBREVIATIONS = {
+    "kh": "krankenhaus",
+    "khs": "krankenhaus",
+    "st": "sankt",
+    "ev": "evangelisches",
+    "kath": "katholisches",
+    "univ": "universitaet",
+    "uni": "universitaet",
+    "med": "medizinisches",
+}
+
+UMLAUTS = str.maketrans({"ä": "ae", "ö": "oe", "ü": "ue", "ß": "ss"})
+
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+@dataclass
+class MatchConfig:
+    """
+    Thresholds for blocked fuzzy matching.
+
+    Args:
+        name_threshold: Minimum name similarity (0-1) for a fuzzy link
+        same_ik_name_threshold: Minimum name similarity within the same IK
+        max_distance_km: Coordinates closer than this count as the same site
+    """
+    name_threshold: float = 0.85
+    same_ik_name_threshold: float = 0.5
+    max_distance_km: float = 0.5
+
+
+# =============================================================================
+# HELPER FUNCTIONS
+# =============================================================================
+
+def normalize_name(name: str) -> str:
+    """Normalize a hospital name for matching (case, umlauts, legal forms)."""
+    if not isinstance(name, str):
+        return ""
+    text = name.lower().translate(UMLAUTS)
+    text = unicodedata.normalize("NFKD", text).encode("ascii", "ignore").decode()
+    text = text.replace("e.v.", " eingetragener verein ").replace("st.", "st ")
+    tokens = re.split(r"[^a-z0-9]+", text)
+    tokens = [NAME_ABBREVIATIONS.get(t, t) for t in tokens if t]
+    return " ".join(t for t in tokens if t not in NAME_STOPWORDS)
+
+
+def normalize_address(street: str, number: str) -> str:
+    """Normalize street and house number (``Str.`` -> ``strasse``)."""
+    if not isinstance(street, str) or not street.strip():
+        return ""
+    text = street.lower().translate(UMLAUTS)
+    text = re.sub(r"str\.?\b", "strasse", text)
+    text = re.sub(r"[^a-z0-9]+", "", text)
+    number = re.sub(r"[^0-9a-z]+", "", str(number).lower()) if isinstance(number, str) else ""
+    return f"{text} {number}".strip()
+
+
+def name_similarity(a: str, b: str) -> float:
+    """
+    Similarity of two normalized names: max of token Jaccard and edit ratio.
+
+    Overlap is measured against all tokens of both names, so a name contained
+    in a longer one ("Klinikum" / "Klinikum Nord") does not score 1.0.
+    """
+    if not a or not b:
+        return 0.0
+    if a == b:
+        return 1.0
+    tokens_a, tokens_b = set(a.split()), set(b.split())
+    overlap = len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+    return max(overlap, SequenceMatcher(None, a, b).ratio())
+
+
+def haversine_km(lat1, lon1, lat2, lon2) -> np.ndarray:
+    """Great-circle distance in km (vectorized)."""
+    lat1, lon1, lat2, lon2 = map(np.radians, (lat1, lon1, lat2, lon2))
+    a = (
+        np.sin((lat2 - lat1) / 2) ** 2
+        + np.cos(lat1) * np.cos(lat2) * np.sin((lon2 - lon1) / 2) ** 2
+    )
+    return 6371.0 * 2 * np.arcsin(np.sqrt(a))
+
+
+def load_sites(con: sqlite3.Connection) -> pd.DataFrame:
+    """Load one row per (Berichtsjahr, IK, Name) site from the analysis DB."""
+    return pd.read_sql_query(SITES_SQL, con=con)
+
+
+class _UnionFind:
+    """
+    Disjoint-set over integer ids that tracks the IKs reporting per year.
+
+    Two clusters that both hold a report for the same Berichtsjahr under
+    different IKs are separate hospitals (a rename or IK change cannot report
+    side by side), so ``can_union`` refuses to merge them.
+    """
+
+    def __init__(self, size: int, year_iks: list[dict[int, set[str]]] | None = None):
+        self._parent = np.arange(size)
+        self._year_iks = year_iks if year_iks is not None else [{} for _ in range(size)]
+
+    def find(self, i: int) -> int:
+        parent = self._parent
+        while parent[i] != i:
+            parent[i] = parent[parent[i]]
+            i = parent[i]
+        return i
+
+    def can_union(self, i: int, j: int) -> bool:
+        """Whether merging the clusters of i and j keeps one IK per year."""
+        a, b = self._year_iks[self.find(i)], self._year_iks[self.find(j)]
+        if len(a) > len(b):
+            a, b = b, a
+        return all(len(iks | b[year]) == 1 for year, iks in a.items() if year in b)
+
+    def union(self, i: int, j: int) -> None:
+        ri, rj = self.find(i), self.find(j)
+        if ri != rj:
+            root, child = min(ri, rj), max(ri, rj)
+            self._parent[child] = root
+            for year, iks in self._year_iks[child].items():
+                self._year_iks[root].setdefault(year, set()).update(iks)
+            self._year_iks[child] = {}
+
+
+# =============================================================================
+# HOSPITAL INDEX
+# =============================================================================
+
+class HospitalIndex:
+    """
+    Persistent hospital identity lookup.
+
+    ``lookup`` has one row per (Berichtsjahr, IK, Name) with columns:
+    hospital_id, canonical_name, canonical_IK, name_norm, address_norm,
+    Postleitzahl, Ort, Latitude, Longitude.
+    """
+
+    def __init__(self, lookup: pd.DataFrame):
+        self._lookup = lookup
+
+    @classmethod
+    def build(
+        cls,
+        sites: pd.DataFrame,
+        config: MatchConfig | None = None,
+        previous: "HospitalIndex | None" = None,
+    ) -> "HospitalIndex":
+        """
+        Build the index from site records (see ``SITES_SQL`` for columns).
+
+        Args:
+            sites: One row per (Berichtsjahr, IK, Name)
+            config: Matching thresholds (default: MatchConfig())
+            previous: Earlier index (e.g. ``HospitalIndex.load(con)``) whose
+                hospital_ids are kept for clusters containing known records
+        """
+        config = config or MatchConfig()
+        missing = set(SITE_COLUMNS) - set(sites.columns)
+        if missing:
+            raise ValueError(f"sites is missing columns: {sorted(missing)}")
+
+        df = sites[SITE_COLUMNS].drop_duplicates(["Berichtsjahr", "IK", "Name"]).reset_index(drop=True)
+        df["IK"] = df["IK"].astype(str)
+        df["Postleitzahl"] = df["Postleitzahl"].astype(str).str.strip()
+        df["name_norm"] = df["Name"].map(normalize_name)
+        df["address_norm"] = [
+            normalize_address(s, n) for s, n in zip(df["Strasse"], df["Hausnummer"])
+        ]
+
+        # Compare distinct variants only - most sites repeat unchanged every year
+        variant_cols = ["IK", "name_norm", "address_norm", "Postleitzahl"]
+        variants = (
+            df.groupby(variant_cols, sort=False, dropna=False)
+            .agg(Latitude=("Latitude", "mean"), Longitude=("Longitude", "mean"))
+            .reset_index()
+        )
+        df = df.merge(variants[variant_cols].reset_index(names="variant"), on=variant_cols, how="left")
+
+        year_iks = [{} for _ in range(len(variants))]
+        for variant, year, ik in zip(df["variant"], df["Berichtsjahr"], df["IK"]):
+            year_iks[variant].setdefault(year, set()).add(ik)
+        uf = _UnionFind(len(variants), year_iks)
+
+        # Exact: same IK + same normalized name
+        for members in variants.groupby(["IK", "name_norm"], sort=False).indices.values():
+            for j in members[1:]:
+                uf.union(members[0], j)
+
+        # Blocked fuzzy: within IK (renames) and within PLZ (IK changes)
+        for block_col, threshold in (
+            ("IK", config.same_ik_name_threshold),
+            ("Postleitzahl", config.name_threshold),
+        ):
+            for members in variants.groupby(block_col, sort=False).indices.values():
+                if len(members) > 1:
+                    cls._link_block(variants, members, threshold, config, uf)
+
+        roots = np.array([uf.find(i) for i in range(len(variants))])
+        df["_root"] = roots[df["variant"].to_numpy()]
+
+        # Canonical attributes come from the most recent report of each cluster
+        latest = df.sort_values(["Berichtsjahr", "IK"]).groupby("_root").tail(1)
+        canonical = latest.set_index("_root")[["Name", "IK"]].rename(
+            columns={"Name": "canonical_name", "IK": "canonical_IK"}
+        )
+        # New clusters are numbered by (lowest IK, lowest name)
+        first_seen = (
+            df.groupby("_root")[["IK", "name_norm"]].min().sort_values(["IK", "name_norm"])
+        )
+        canonical = canonical.loc[first_seen.index]
+        canonical["hospital_id"] = cls._assign_ids(df, first_seen.index, previous)
+
+        lookup = df.join(canonical, on="_root")
+        lookup = lookup[[
+            "Berichtsjahr", "IK", "Name", "hospital_id", "canonical_name", "canonical_IK",
+            "name_norm", "address_norm", "Postleitzahl", "Ort", "Latitude", "Longitude",
+        ]].sort_values(["hospital_id", "Berichtsjahr"]).reset_index(drop=True)
+        return cls(lookup)
+
+    @staticmethod
+    def _assign_ids(
+        df: pd.DataFrame,
+        order: pd.Index,
+        previous: "HospitalIndex | None",
+    ) -> np.ndarray:
+        """
+        Reuse previous hospital_ids and number only new clusters.
+
+        A cluster keeps the lowest previous id among its records. If a previous
+        hospital was split, the cluster holding most of its records keeps the id.
+        """
+        ids = pd.Series(0, index=order, dtype="int64")
+        next_id = 1
+        if previous is not None and len(previous.lookup):
+            known = previous.lookup[["Berichtsjahr", "IK", "Name", "hospital_id"]].copy()
+            known["IK"] = known["IK"].astype(str)
+            matched = df[["Berichtsjahr", "IK", "Name", "_root"]].merge(
+                known, on=["Berichtsjahr", "IK", "Name"], how="inner"
+            )
+            claims = (
+                matched.groupby(["_root", "hospital_id"]).size().rename("records").reset_index()
+                .sort_values(["hospital_id", "records"], ascending=[True, False], kind="stable")
+                .drop_duplicates("hospital_id")  # a split id goes to its largest part
+                .sort_values("hospital_id")
+                .drop_duplicates("_root")  # a merged cluster keeps its lowest id
+            )
+            ids.loc[claims["_root"].to_numpy()] = claims["hospital_id"].to_numpy()
+            next_id = int(known["hospital_id"].max()) + 1
+
+        new = ids.index[ids.to_numpy() == 0]
+        ids.loc[new] = np.arange(next_id, next_id + len(new))
+        return ids.to_numpy()
+
+    @staticmethod
+    def _link_block(
+        variants: pd.DataFrame,
+        members: np.ndarray,
+        threshold: float,
+        config: MatchConfig,
+        uf: _UnionFind,
+    ) -> None:
+        """Pairwise-compare variants in one block and union the matches."""
+        names = variants["name_norm"].to_numpy()[members]
+        addresses = variants["address_norm"].to_numpy()[members]
+        lat = variants["Latitude"].to_numpy()[members]
+        lon = variants["Longitude"].to_numpy()[members]
+
+        i_idx, j_idx = np.triu_indices(len(members), k=1)
+        dist = haversine_km(lat[i_idx], lon[i_idx], lat[j_idx], lon[j_idx])
+        close = np.nan_to_num(dist, nan=np.inf) <= config.max_distance_km
+        same_address = (addresses[i_idx] == addresses[j_idx]) & (addresses[i_idx] != "")
+        located = close | same_address
+
+        for i, j in zip(i_idx[located], j_idx[located]):
+            a, b = members[i], members[j]
+            if uf.find(a) == uf.find(b) or not uf.can_union(a, b):
+                continue
+            if name_similarity(names[i], names[j]) >= threshold:
+                uf.union(a, b)
+
+    @property
+    def lookup(self) -> pd.DataFrame:
+        """Return the lookup table (one row per Berichtsjahr, IK, Name)."""
+        return self._lookup
+
+    def resolve(self, df: pd.DataFrame, name_col: str = "Name") -> pd.DataFrame:
+        """
+        Attach hospital_id and canonical_name to a query result.
+
+        Args:
+            df: Frame with Berichtsjahr, IK and a hospital name column
+            name_col: Name column in df (e.g. 'KH_Name')
+        """
+        keys = self._lookup[["Berichtsjahr", "IK", "Name", "hospital_id", "canonical_name"]]
+        if name_col != "Name":
+            keys = keys.rename(columns={"Name": name_col})
+        out = df.copy()
+        out["IK"] = out["IK"].astype(str)
+        return out.merge(keys, on=["Berichtsjahr", "IK", name_col], how="left")
+
+    def save(self, con: sqlite3.Connection, table: str = INDEX_TABLE) -> None:
+        """Write the lookup table to the DB and index it for joins."""
+        self._lookup.to_sql(table, con, if_exists="replace", index=False)
+        con.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_key ON {table} (Berichtsjahr, IK, Name)"
+        )
+        con.execute(
+            f"CREATE INDEX IF NOT EXISTS idx_{table}_id ON {table} (hospital_id)"
+        )
+        con.commit()
+
+    @classmethod
+    def load(cls, con: sqlite3.Connection, table: str = INDEX_TABLE) -> "HospitalIndex":
+        """Load a previously saved index from the DB."""
+        return cls(pd.read_sql_query(f"SELECT * FROM {table}", con=con))
+
+
+# =============================================================================
+# MODULE EXPORTS
+# =============================================================================
+
+__all__ = [
+    "HospitalIndex",
+    "MatchConfig",
+    "load_sites",
+    "normalize_name",
+    "normalize_address",
+    "name_similarity",
+    "INDEX_TABLE",
+    "SITES_SQL",
+]
@@ -21,7 +21,9 @@ Usage:
 
 from __future__ import annotations
 
+import copy
 import os
+import re
 from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Any, Literal, TYPE_CHECKING
@@ -36,6 +38,8 @@ from pptx.oxml import parse_xml
 if TYPE_CHECKING:
     import pandas as pd
 
+from text_fit import OverflowReport, find_overflow, fit_font_size, split_text
+
 # Try to import PIL for image detection, fall back gracefully
 try:
     from PIL import Image
@@ -93,6 +97,9 @@ BODY_SPEC = {
     "line_spacing": 1.15,
 }
 
+# Smallest size body(fit=True) shrinks to
+MIN_BODY_FONT_SIZE = Pt(10)
+
 FOOTER_SPEC = {
     "left": Inches(2.82),
     "top": Inches(6.95),
@@ -130,6 +137,24 @@ LAYOUT_BLANK = 2
 LAYOUT_TITLE_VARIANT = 3
 LAYOUT_TITLE_AND_CONTENT = 4
 
+# =============================================================================
+# COLUMN FORMATS (shared by slide tables and Excel exports)
+# =============================================================================
+
+# Format kind -> (Python format spec, Excel number format)
+COLUMN_FORMATS = {
+    "integer": ("{:,.0f}", "#,##0"),
+    "decimal": ("{:,.1f}", "#,##0.0"),
+    "text": ("{}", "General"),
+}
+
+# Key and year columns are shown as plain text, never with thousands separators
+IDENTIFIER_COLUMNS = {"IK", "canonical_IK", "Postleitzahl", "Berichtsjahr"}
+IDENTIFIER_SUFFIXES = ("_id", "_ID")
+
+
+# Placeholder tokens in stamp prototypes, e.g. "{Name}"
+STAMP_TOKEN = re.compile(r"\{(\w+)\}")
 
 # =============================================================================
 # HELPER FUNCTIONS
@@ -175,6 +200,45 @@ def detect_image_layout(image_path: str | Path) -> str:
         return "image_left"
 
 
+def column_format(series: "pd.Series") -> str:
+    """
+    Determine the display format for a whole column.
+
+    Returns:
+        'integer': Integer columns, and float columns with only whole numbers
+        'decimal': Float columns with fractional values (1 decimal place)
+        'text': Identifier and year columns (IK, Postleitzahl, Berichtsjahr,
+            *_id) and everything else
+    """
+    import pandas as pd
+
+    name = str(series.name)
+    if name in IDENTIFIER_COLUMNS or name.endswith(IDENTIFIER_SUFFIXES):
+        return "text"
+    if pd.api.types.is_bool_dtype(series):
+        return "text"
+    if pd.api.types.is_integer_dtype(series):
+        return "integer"
+    if pd.api.types.is_float_dtype(series):
+        values = series.dropna()
+        return "integer" if (values == values.round()).all() else "decimal"
+    return "text"
+
+
+def format_value(value: Any, kind: str) -> str:
+    """Format a single value for display using a column format kind."""
+    import pandas as pd
+
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return ""
+    if kind == "text":
+        # Whole floats come from integer keys with missing values (e.g. IK)
+        if isinstance(value, float) and value.is_integer():
+            return str(int(value))
+        return str(value)
+    return COLUMN_FORMATS[kind][0].format(value)
+
+
 # =============================================================================
 # CONFIGURATION
 # =============================================================================
@@ -267,11 +331,17 @@ class SlideBuilder:
 
         return self
 
-    def body(self, text: str, position: dict | None = None) -> "SlideBuilder":
+    def body(self, text: str, position: dict | None = None, fit: bool = False) -> "SlideBuilder":
         """
         Add body text to the slide.
 
         If an image has been added, text position is adjusted based on layout.
+
+        Args:
+            text: Body text (newlines start new paragraphs)
+            position: Box position (default: BODY_SPEC or the image layout's text box)
+            fit: Shrink the font size until the text is predicted to fit
+                (down to MIN_BODY_FONT_SIZE)
         """
         if position is None:
             if self._image_layout and "text" in IMAGE_LAYOUTS.get(self._image_layout, {}):
@@ -294,6 +364,13 @@ class SlideBuilder:
         tf = txBox.text_frame
         tf.word_wrap = True
 
+        font_size = BODY_SPEC["font_size"]
+        if fit:
+            font_size = fit_font_size(
+                text, position["width"], position["height"], font_size,
+                min_font_size=MIN_BODY_FONT_SIZE, font_name=self._config.body_font,
+            ) or MIN_BODY_FONT_SIZE
+
         # Handle multiline text
         lines = text.split("\n")
         for i, line in enumerate(lines):
@@ -303,7 +380,7 @@ class SlideBuilder:
                 p = tf.add_paragraph()
             p.text = line
             p.font.name = self._config.body_font
-            p.font.size = BODY_SPEC["font_size"]
+            p.font.size = font_size
             p.font.color.rgb = hex_to_rgb(self._config.text_color)
 
         return self
@@ -312,6 +389,7 @@ class SlideBuilder:
         self,
         path: str | Path,
         layout: Literal["auto", "image_top", "image_left", "image_right", "full_image"] = "auto",
+        name: str | None = None,
     ) -> "SlideBuilder":
         """
         Add an image to the slide with smart positioning.
@@ -319,6 +397,7 @@ class SlideBuilder:
         Args:
             path: Path to the image file
             layout: Layout mode - 'auto' detects from aspect ratio
+            name: Shape name (used to swap the picture in PPTGenerator.stamp_slides)
         """
         path = Path(path)
         if not path.exists():
@@ -332,12 +411,14 @@ class SlideBuilder:
 
         pos = IMAGE_LAYOUTS[layout]["image"]
 
-        self._slide.shapes.add_picture(
+        picture = self._slide.shapes.add_picture(
             str(path),
             Inches(pos["left"]),
             Inches(pos["top"]),
             width=Inches(pos["width"]),
         )
+        if name:
+            picture.name = name
 
         return self
 
@@ -355,8 +436,6 @@ class SlideBuilder:
             columns: Columns to include (default: all)
             max_rows: Maximum rows to display (default: 15)
         """
-        import pandas as pd
-
         if columns:
             data = data[columns]
 
@@ -389,23 +468,12 @@ class SlideBuilder:
             p.font.bold = True
             p.font.color.rgb = hex_to_rgb(self._config.text_color)
 
-        # Fill data
-        for row_idx, (_, row) in enumerate(data.iterrows(), start=1):
-            for col_idx, value in enumerate(row):
+        # Fill data (number format is decided once per column)
+        for col_idx, col_name in enumerate(data.columns):
+            kind = column_format(data[col_name])
+            for row_idx, value in enumerate(data[col_name].tolist(), start=1):
                 cell = table.cell(row_idx, col_idx)
-
-                # Format numbers
-                if isinstance(value, (int, float)):
-                    if pd.isna(value):
-                        cell.text = ""
-                    elif isinstance(value, float) and value == int(value):
-                        cell.text = f"{int(value):,}"
-                    elif isinstance(value, float):
-                        cell.text = f"{value:,.1f}"
-                    else:
-                        cell.text = f"{value:,}"
-                else:
-                    cell.text = str(value) if not pd.isna(value) else ""
+                cell.text = format_value(value, kind)
 
                 p = cell.text_frame.paragraphs[0]
                 p.font.name = self._config.body_font
@@ -676,6 +744,160 @@ class PPTGenerator:
 
         return builder
 
+    def add_text_slides(self, title: str, text: str, action_title: str = "") -> list[SlideBuilder]:
+        """
+        Add body text across as many content slides as it needs.
+
+        Text is split between paragraphs (or wrapped lines) wherever the
+        BODY_SPEC box is predicted to be full; continuation slides get the
+        same title with a "(cont.)" suffix.
+
+        Args:
+            title: Slide title
+            text: Body text
+            action_title: Secondary title, first slide only (optional)
+
+        Returns:
+            SlideBuilder for each slide added
+        """
+        chunks = split_text(
+            text, BODY_SPEC["width"], BODY_SPEC["height"], BODY_SPEC["font_size"],
+            font_name=self._config.body_font,
+        )
+        builders = []
+        for i, chunk in enumerate(chunks):
+            slide_title = title if i == 0 else f"{title} (cont.)"
+            builder = self.add_content_slide(slide_title, action_title if i == 0 else "")
+            builders.append(builder.body(chunk))
+        return builders
+
+    def check_overflow(self) -> list[OverflowReport]:
+        """
+        Predict text overflow for the whole deck without rendering it.
+
+        Tables are checked against the footer position.
+
+        Returns:
+            List of OverflowReport (empty if everything fits)
+        """
+        return find_overflow(self._prs, bottom_limit=FOOTER_SPEC["top"])
+
+    def stamp_slides(
+        self,
+        prototype: SlideBuilder,
+        data: "pd.DataFrame",
+        images: dict[str, str] | None = None,
+        keep_prototype: bool = False,
+    ) -> list[SlideBuilder]:
+        """
+        Stamp out one slide per DataFrame row from a prepared prototype slide.
+
+        Build the prototype once with the normal API, using ``{column}``
+        tokens in any text. Each stamped slide is a deep copy of the
+        prototype's shape XML with only the tokens and picture references
+        replaced, so title, footer and text-box geometry is not rebuilt.
+        Stamped slides are appended at the end of the deck.
+
+        Tokens in uppercased titles (``{NAME}``) match columns
+        case-insensitively and the filled value is uppercased too.
+
+        Args:
+            prototype: SlideBuilder of the prepared slide
+            data: One row per slide to stamp
+            images: Picture shape name -> column with an image path per row
+            keep_prototype: Keep the prototype slide in the deck (default: False)
+
+        Returns:
+            SlideBuilder for each stamped slide, in row order
+
+        Example:
+            proto = ppt.add_content_slide("{Name}", "{Ort} | {Bundesland}")
+            proto.body("Procedures 2023: {total_procedures}")
+            proto.image("placeholder.png", name="chart")
+            ppt.stamp_slides(proto, hospitals, images={"chart": "chart_path"})
+        """
+        images = images or {}
+        proto_slide = prototype.slide
+        proto_part = proto_slide.part
+        skip_tags = {qn("p:nvGrpSpPr"), qn("p:grpSpPr")}
+        proto_shapes = [el for el in proto_slide.shapes._spTree if el.tag not in skip_tags]
+
+        # Locate everything that varies once, by position in document order
+        rel_ns = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+        text_slots, rel_slots, picture_slots = [], [], {}
+        current_picture = None
+        for idx, el in enumerate(node for shape in proto_shapes for node in shape.iter()):
+            if el.tag == qn("p:cNvPr") and el.get("name") in images:
+                current_picture = images[el.get("name")]
+            elif el.tag == qn("a:t") and el.text and STAMP_TOKEN.search(el.text):
+                text_slots.append((idx, el.text))
+            elif el.tag == qn("a:blip") and current_picture is not None:
+                picture_slots[idx] = current_picture
+                current_picture = None
+            for attr, rId in el.attrib.items():
+                if attr.startswith(rel_ns):
+                    rel_slots.append((idx, attr, proto_part.rels[rId]))
+
+        columns = {str(c).lower(): c for c in data.columns}
+        kinds = {c: column_format(data[c]) for c in data.columns}
+        values = {c: data[c].tolist() for c in data.columns}
+
+        def fill(text: str, row: int) -> str:
+            def replace(match: re.Match) -> str:
+                token = match.group(1)
+                column = columns.get(token.lower())
+                if column is None:
+                    return match.group(0)
+                value = format_value(values[column][row], kinds[column])
+                return value.upper() if token.isupper() else value
+            return STAMP_TOKEN.sub(replace, text)
+
+        builders = []
+        for row in range(len(data)):
+            slide = self._prs.slides.add_slide(proto_slide.slide_layout)
+            tree = slide.shapes._spTree
+            for el in [el for el in tree if el.tag not in skip_tags]:
+                tree.remove(el)
+            copies = [copy.deepcopy(el) for el in proto_shapes]
+            for el in copies:
+                tree.append(el)
+            nodes = [node for shape in copies for node in shape.iter()]
+
+            for idx, text in text_slots:
+                nodes[idx].text = fill(text, row)
+
+            new_ids = {}
+            for idx, attr, rel in rel_slots:
+                column = picture_slots.get(idx)
+                path = values[column][row] if column is not None else None
+                if isinstance(path, (str, Path)) and path:
+                    _, rId = slide.part.get_or_add_image_part(str(path))
+                else:
+                    if rel.rId not in new_ids:
+                        new_ids[rel.rId] = (
+                            slide.part.relate_to(rel.target_ref, rel.reltype, is_external=True)
+                            if rel.is_external
+                            else slide.part.relate_to(rel.target_part, rel.reltype)
+                        )
+                    rId = new_ids[rel.rId]
+                nodes[idx].set(attr, rId)
+
+            builders.append(SlideBuilder(slide, self._config, self))
+
+        if not keep_prototype:
+            self._remove_slide(proto_slide)
+
+        return builders
+
+    def _remove_slide(self, slide) -> None:
+        """Remove a slide and its relationship from the presentation."""
+        xml_slides = self._prs.slides._sldIdLst
+        for sldId in list(xml_slides):
+            if self._prs.part.related_part(sldId.rId) is slide.part:
+                self._prs.part.drop_rel(sldId.rId)
+                xml_slides.remove(sldId)
+                break
+
     def save(self, output_path: str | Path) -> Path:
         """
         Save the presentation to file.
@@ -796,6 +1018,10 @@ __all__ = [
     "SlideBuilder",
     "quick_ppt",
     "detect_image_layout",
+    "column_format",
+    "format_value",
+    "IDENTIFIER_COLUMNS",
     "BRAND",
+    "COLUMN_FORMATS",
     "IMAGE_LAYOUTS",
 ]
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from hospital_index import HospitalIndex, name_similarity, normalize_name
+
+
+def _site(year, ik, name, street="Kerpener Str.", number="62", plz="50937", lat=50.9246, lon=6.9181):
+    return {
+        "Berichtsjahr": year, "IK": ik, "Name": name, "Strasse": street, "Hausnummer": number,
+        "Postleitzahl": plz, "Ort": "Köln", "Latitude": lat, "Longitude": lon,
+    }
+
+
+def _ids(index: HospitalIndex) -> dict[str, set[int]]:
+    return index.lookup.groupby("IK")["hospital_id"].agg(set).to_dict()
+
+
+def test_same_year_same_address_stays_separate():
+    sites = pd.DataFrame([
+        _site(year, ik, name)
+        for year in (2021, 2022, 2023)
+        for ik, name in (
+            ("260100001", "Universitätsklinikum Köln"),
+            ("260100002", "Kinderklinik Universitätsklinikum Köln"),
+        )
+    ])
+    ids = _ids(HospitalIndex.build(sites))
+    assert len(ids["260100001"]) == 1
+    assert ids["260100001"].isdisjoint(ids["260100002"])
+
+
+def test_ik_change_between_years_is_linked():
+    sites = pd.DataFrame([
+        _site(2021, "260100001", "Universitätsklinikum Köln"),
+        _site(2022, "260100009", "Universitätsklinikum Köln AöR"),
+    ])
+    assert HospitalIndex.build(sites).lookup["hospital_id"].nunique() == 1
+
+
+def test_name_subset_is_not_a_full_match():
+    assert name_similarity(normalize_name("Klinikum"), normalize_name("Klinikum Nord")) < 0.85
@@ -0,0 +1,441 @@
+"""
+Text Fitting Module for Promiscuous-Peacock
+
+Predicts line breaks and text height for slide text boxes without rendering
+the deck in PowerPoint or LibreOffice. Uses cached glyph advance widths for
+Reddit Sans: read from the installed TTF when available, otherwise from a
+built-in approximation of the font's character widths. The approximation is
+only an estimate and raises a UserWarning (see ``has_font_metrics``).
+
+Features:
+- Greedy word wrap matching PowerPoint's line breaking closely enough to
+  predict overflow
+- Largest font size that fits a box (auto-shrink)
+- Splitting text into chunks for continuation slides
+- One-pass overflow report for a whole presentation (text boxes and tables)
+
+Usage:
+    from text_fit import find_overflow, fit_font_size
+
+    size = fit_font_size(text, Inches(5.5), Inches(4.5), Pt(14))
+
+    for report in find_overflow(ppt.presentation):
+        print(report)
+"""
+
+from __future__ import annotations
+
+import os
+import warnings
+from bisect import bisect_right
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate
+from pathlib import Path
+
+from pptx.util import Emu, Inches, Pt
+
+# Try to import PIL for reading real glyph metrics, fall back gracefully
+try:
+    from PIL import ImageFont
+    HAS_PIL = True
+except ImportError:
+    HAS_PIL = False
+
+
+# =============================================================================
+# CONSTANTS
+# =============================================================================
+
+# Directories searched for Reddit Sans TTF files
+FONT_DIRS = [
+    Path.home() / "Library" / "Fonts",
+    Path("/Library/Fonts"),
+    Path.home() / ".fonts",
+    Path.home() / ".local" / "share" / "fonts",
+    Path("/usr/share/fonts"),
+    Path(os.environ.get("WINDIR", "C:/Windows")) / "Fonts",
+]
+
+# Approximate advance widths (fraction of em) for a humanist sans like Reddit
+# Sans; used only when the TTF is not installed, with a warning, because
+# predictions from these are estimates rather than Reddit Sans metrics
+FALLBACK_WIDTHS = {
+    **{c: 0.24 for c in "iljI.,:;'|!`"},
+    **{c: 0.33 for c in "frt()[]{}-\"/\\"},
+    **{c: 0.47 for c in "acesvxyzkJ?"},
+    **{c: 0.53 for c in "bdghnopquäöü"},
+    **{c: 0.78 for c in "mw"},
+    **{c: 0.56 for c in "0123456789$€"},
+    **{c: 0.62 for c in "ABCDEFGHKLNOPQRSTUVXYZÄÖÜ"},
+    **{c: 0.86 for c in "MW%@"},
+    " ": 0.25,
+}
+FALLBACK_DEFAULT = 0.55
+FALLBACK_BOLD_FACTOR = 1.06
+
+# PowerPoint defaults
+DEFAULT_FONT_SIZE = Pt(18)
+LINE_HEIGHT = 1.2  # single line spacing as a multiple of font size
+INSET_LEFT_RIGHT = Inches(0.1)
+INSET_TOP_BOTTOM = Inches(0.05)
+
+
+# =============================================================================
+# GLYPH METRICS
+# =============================================================================
+
+@lru_cache(maxsize=None)
+def find_font_file(font_name: str = "Reddit Sans", bold: bool = False) -> Path | None:
+    """Locate an installed TTF for the font, or None if not installed."""
+    stem = font_name.replace(" ", "")
+    weight = "Bold" if bold else "Regular"
+    candidates = [f"{stem}-{weight}.ttf", f"{stem}*{weight}*.ttf", f"{stem}*.ttf"]
+    for directory in FONT_DIRS:
+        if not directory.is_dir():
+            continue
+        for pattern in candidates:
+            matches = sorted(directory.rglob(pattern))
+            if matches:
+                return matches[0]
+    return None
+
+
+@lru_cache(maxsize=None)
+def _truetype(font_name: str, bold: bool):
+    """Load the TTF at 1000 units per em (cached)."""
+    path = find_font_file(font_name, bold)
+    if path is None or not HAS_PIL:
+        return None
+    try:
+        return ImageFont.truetype(str(path), 1000)
+    except OSError:
+        return None
+
+
+def has_font_metrics(font_name: str = "Reddit Sans", bold: bool = False) -> bool:
+    """Whether real glyph metrics are available (TTF installed and PIL present)."""
+    return _truetype(font_name, bold) is not None
+
+
+@lru_cache(maxsize=None)
+def _warn_fallback(font_name: str, bold: bool) -> None:
+    """Warn once per font that widths come from FALLBACK_WIDTHS."""
+    reason = "PIL is not installed" if not HAS_PIL else "no TTF was found in FONT_DIRS"
+    warnings.warn(
+        f"{font_name} {'Bold' if bold else 'Regular'} metrics unavailable ({reason}); "
+        "text fitting and overflow checks use approximate fallback widths. "
+        "Install the font for reliable predictions.",
+        UserWarning,
+        stacklevel=2,
+    )
+
+
+@lru_cache(maxsize=65536)
+def char_width(char: str, font_name: str = "Reddit Sans", bold: bool = False) -> float:
+    """Advance width of one character as a fraction of the em size."""
+    font = _truetype(font_name, bold)
+    if font is not None:
+        return font.getlength(char) / 1000
+    _warn_fallback(font_name, bold)
+    width = FALLBACK_WIDTHS.get(char, FALLBACK_DEFAULT)
+    return width * FALLBACK_BOLD_FACTOR if bold else width
+
+
+def text_width(text: str, font_size: int, font_name: str = "Reddit Sans", bold: bool = False) -> int:
+    """Width of a single line of text in EMU."""
+    return int(sum(char_width(c, font_name, bold) for c in text) * font_size)
+
+
+# =============================================================================
+# LINE BREAKING
+# =============================================================================
+
+def wrap_lines(
+    text: str,
+    width: int,
+    font_size: int,
+    font_name: str = "Reddit Sans",
+    bold: bool = False,
+) -> list[str]:
+    """
+    Predict line breaks for text in a box of the given inner width (EMU).
+
+    Paragraphs split on newlines; words longer than a line are broken by
+    character, as PowerPoint does.
+    """
+    lines = []
+    for paragraph in text.split("\n"):
+        spans = line_spans(paragraph, width, font_size, font_name, bold)
+        lines.extend(paragraph[start:end] for start, end in spans)
+    return lines
+
+
+def line_spans(
+    paragraph: str,
+    width: int,
+    font_size: int,
+    font_name: str = "Reddit Sans",
+    bold: bool = False,
+) -> list[tuple[int, int]]:
+    """
+    Predicted lines of one paragraph as (start, end) character offsets.
+
+    Slicing the paragraph with these keeps the original text intact, including
+    words that were broken across lines.
+    """
+    space = char_width(" ", font_name, bold) * font_size
+    spans = []
+    line_start, line_end, line_width = 0, 0, 0.0
+    position = 0
+    for word in paragraph.split(" "):
+        word_start, word_end = position, position + len(word)
+        position = word_end + 1
+        word_width = text_width(word, font_size, font_name, bold)
+        if line_end > line_start and line_width + space + word_width <= width:
+            line_end, line_width = word_end, line_width + space + word_width
+            continue
+        if line_end > line_start:
+            spans.append((line_start, line_end))
+        # Break words wider than the box character by character, finding
+        # each cut by bisecting the cumulative glyph widths
+        if word_width > width and len(word) > 1:
+            offsets = list(accumulate(
+                (char_width(c, font_name, bold) for c in word), initial=0.0
+            ))
+            limit = width / font_size
+            start = 0
+            while offsets[-1] - offsets[start] > limit and len(word) - start > 1:
+                cut = max(bisect_right(offsets, offsets[start] + limit) - 1, start + 1)
+                spans.append((word_start + start, word_start + cut))
+                start = cut
+            word_start += start
+            word_width = text_width(paragraph[word_start:word_end], font_size, font_name, bold)
+        line_start, line_end, line_width = word_start, word_end, word_width
+    spans.append((line_start, line_end))
+    return spans
+
+
+def text_height(n_lines: int, font_size: int, line_spacing: float = 1.0) -> int:
+    """Height of n lines in EMU including top and bottom insets."""
+    return int(n_lines * font_size * LINE_HEIGHT * line_spacing) + 2 * INSET_TOP_BOTTOM
+
+
+def fits(
+    text: str,
+    width: int,
+    height: int,
+    font_size: int,
+    font_name: str = "Reddit Sans",
+    bold: bool = False,
+    line_spacing: float = 1.0,
+) -> bool:
+    """Whether text fits a box of the given outer width and height (EMU)."""
+    lines = wrap_lines(text, width - 2 * INSET_LEFT_RIGHT, font_size, font_name, bold)
+    return text_height(len(lines), font_size, line_spacing) <= height
+
+
+def fit_font_size(
+    text: str,
+    width: int,
+    height: int,
+    font_size: int,
+    min_font_size: int = Pt(9),
+    font_name: str = "Reddit Sans",
+    bold: bool = False,
+    line_spacing: float = 1.0,
+) -> int | None:
+    """
+    Largest font size (in whole points, at most font_size) that fits the box.
+
+    Returns:
+        Font size in EMU, or None if the text does not fit at min_font_size
+    """
+    size_pt = int(Emu(font_size).pt)
+    while size_pt >= Emu(min_font_size).pt:
+        if fits(text, width, height, Pt(size_pt), font_name, bold, line_spacing):
+            return Pt(size_pt)
+        size_pt -= 1
+    return None
+
+
+def split_text(
+    text: str,
+    width: int,
+    height: int,
+    font_size: int,
+    font_name: str = "Reddit Sans",
+    bold: bool = False,
+    line_spacing: float = 1.0,
+) -> list[str]:
+    """
+    Split text into chunks that each fit the box, breaking between lines.
+
+    Used for continuation slides; paragraph boundaries are preferred, but a
+    single over-long paragraph is split between its wrapped lines.
+    """
+    inner = width - 2 * INSET_LEFT_RIGHT
+    line_height = font_size * LINE_HEIGHT * line_spacing
+    max_lines = max(1, int((height - 2 * INSET_TOP_BOTTOM) // line_height))
+
+    chunks, current, used = [], [], 0
+    for paragraph in text.split("\n"):
+        spans = line_spans(paragraph, inner, font_size, font_name, bold)
+        n = len(spans)
+        if used + n <= max_lines:
+            current.append(paragraph)
+            used += n
+            continue
+        if current:
+            chunks.append("\n".join(current))
+            current, used = [], 0
+        if n <= max_lines:
+            current, used = [paragraph], n
+            continue
+        # Paragraph longer than a whole box: cut between wrapped lines, slicing
+        # the original text so words broken across lines stay whole
+        for start in range(0, n, max_lines):
+            piece = spans[start:start + max_lines]
+            text_piece = paragraph[piece[0][0]:piece[-1][1]]
+            if len(piece) == max_lines:
+                chunks.append(text_piece)
+            else:
+                current, used = [text_piece], len(piece)
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
+
+
+# =============================================================================
+# OVERFLOW DETECTION
+# =============================================================================
+
+@dataclass
+class OverflowReport:
+    """
+    One shape whose text is predicted not to fit.
+
+    Args:
+        slide_number: 1-based slide position in the deck
+        shape_name: Shape name as shown in PowerPoint's selection pane
+        kind: 'height' (too many lines), 'width' (unwrapped line too long)
+            or 'table' (table runs past the bottom limit)
+        required: Predicted size in inches
+        available: Available size in inches
+        text: Start of the shape's text
+    """
+    slide_number: int
+    shape_name: str
+    kind: str
+    required: float
+    available: float
+    text: str
+
+    def __str__(self) -> str:
+        return (
+            f"Slide {self.slide_number} / {self.shape_name}: {self.kind} overflow "
+            f"{self.required:.2f}\" > {self.available:.2f}\" ({self.text!r})"
+        )
+
+
+def _paragraph_style(paragraph) -> tuple[int, str, bool]:
+    """Font size, name and bold of a paragraph from its first sized run."""
+    size, name, bold = None, None, False
+    for run in paragraph.runs:
+        size = size or run.font.size
+        name = name or run.font.name
+        bold = bold or bool(run.font.bold)
+    size = size or paragraph.font.size or DEFAULT_FONT_SIZE
+    name = name or paragraph.font.name or "Reddit Sans"
+    bold = bold or bool(paragraph.font.bold)
+    return size, name, bold
+
+
+def _frame_height(text_frame, width: int) -> tuple[int, int, int]:
+    """Predicted (height, widest unwrapped line, line count) of a text frame in EMU."""
+    inner = width - 2 * INSET_LEFT_RIGHT
+    wrap = text_frame.word_wrap is not False
+    height, widest, total_lines = 2 * INSET_TOP_BOTTOM, 0, 0
+    for paragraph in text_frame.paragraphs:
+        size, name, bold = _paragraph_style(paragraph)
+        spacing = paragraph.line_spacing if isinstance(paragraph.line_spacing, float) else 1.0
+        text = "".join(run.text for run in paragraph.runs)
+        if wrap:
+            n_lines = len(wrap_lines(text, inner, size, name, bold))
+        else:
+            n_lines = 1
+            widest = max(widest, text_width(text, size, name, bold) + 2 * INSET_LEFT_RIGHT)
+        height += int(n_lines * size * LINE_HEIGHT * spacing)
+        total_lines += n_lines
+    return height, widest, total_lines
+
+
+def find_overflow(presentation, bottom_limit: int | None = None) -> list[OverflowReport]:
+    """
+    Report every text box and table predicted to overflow, in one pass.
+
+    Args:
+        presentation: python-pptx Presentation (e.g. PPTGenerator.presentation)
+        bottom_limit: Tables must end above this y position in EMU
+            (default: slide height)
+
+    Returns:
+        List of OverflowReport, in slide order
+    """
+    bottom_limit = bottom_limit or presentation.slide_height
+    reports = []
+
+    for number, slide in enumerate(presentation.slides, start=1):
+        for shape in slide.shapes:
+            if shape.has_text_frame and shape.text_frame.text.strip():
+                height, widest, n_lines = _frame_height(shape.text_frame, shape.width)
+                preview = shape.text_frame.text[:40]
+                # Single lines may exceed tight boxes (e.g. TITLE_SPEC) by design
+                if height > shape.height and n_lines > 1:
+                    reports.append(OverflowReport(
+                        number, shape.name, "height",
+                        Emu(height).inches, Emu(shape.height).inches, preview,
+                    ))
+                if widest > shape.width:
+                    reports.append(OverflowReport(
+                        number, shape.name, "width",
+                        Emu(widest).inches, Emu(shape.width).inches, preview,
+                    ))
+
+            elif shape.has_table:
+                # PowerPoint grows rows to fit their text, pushing the table down
+                table = shape.table
+                widths = [column.width for column in table.columns]
+                total = 0
+                for row in table.rows:
+                    needed = max(
+                        _frame_height(cell.text_frame, widths[i])[0]
+                        for i, cell in enumerate(row.cells)
+                    )
+                    total += max(row.height, needed)
+                if shape.top + total > bottom_limit:
+                    reports.append(OverflowReport(
+                        number, shape.name, "table",
+                        Emu(shape.top + total).inches, Emu(bottom_limit).inches,
+                        table.cell(0, 0).text[:40],
+                    ))
+
+    return reports
+
+
+# =============================================================================
+# MODULE EXPORTS
+# =============================================================================
+
+__all__ = [
+    "OverflowReport",
+    "find_overflow",
+    "fit_font_size",
+    "fits",
+    "split_text",
+    "wrap_lines",
+    "line_spans",
+    "text_width",
+    "char_width",
+    "has_font_metrics",
+]